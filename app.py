@@ -3,35 +3,123 @@ ProctorGuard - Online Exam Proctoring System
 Flask backend application for exam monitoring and student surveillance
 """
 
-from flask import Flask, jsonify, request, render_template, redirect, url_for
-from flask_cors import CORS
+from flask import (
+    Flask, Blueprint, jsonify, request, render_template, redirect, url_for, make_response,
+    stream_with_context
+)
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+from flask_caching import Cache
+from concurrent.futures import TimeoutError as FrameTimeoutError
 from datetime import datetime
+from functools import lru_cache, wraps
+from urllib.parse import urlencode
+from jinja2 import FileSystemBytecodeCache
+import base64
+import hashlib
 import logging
-import json
+import time
+import uuid
+import orjson
 from models import (
     init_database,
     fetch_one,
     fetch_all,
+    iter_rows,
+    submission_row,
+    SUBMISSION_COLUMNS,
     add_student,
     add_exam,
     add_alert,
     add_submission,
-    add_violation_screenshot
+    add_violation_screenshot,
+    add_violation_screenshots_bulk,
+    decode_screenshot,
+    transaction
+)
+from detection import FramePoolFull, submit_frame
+from pydantic import ValidationError
+from schemas import (
+    StudentIn, ExamIn, AlertIn, FrameIn,
+    resolve_student_id, normalize_exam_ref, validation_message
 )
-from detection import analyze_frame
+
+
+class OrjsonProvider(JSONProvider):
+    """Serialize JSON with orjson so jsonify() skips the pure-Python encoder."""
+
+    mimetype = 'application/json'
+
+    @staticmethod
+    def _options(kwargs) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self._options(kwargs)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        dump_args = {'indent': True} if self._app.debug else {}
+        return self._app.response_class(
+            orjson.dumps(obj, option=self._options(dump_args)),
+            mimetype=self.mimetype
+        )
 
 
 # Initialize Flask application
 app = Flask(__name__)
 app.config.from_object('config')
+app.json = OrjsonProvider(app)
+# orjson never sorts keys or escapes non-ASCII unless asked; don't let the
+# Jinja |tojson filter ask for sorting either
+app.jinja_env.policies['json.dumps_kwargs'] = {'sort_keys': False}
+
+# Keep compiled templates on disk so new workers don't re-parse them
+if app.config.get('JINJA_BYTECODE_CACHE'):
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config.get('JINJA_BYTECODE_CACHE_DIR'))
 
 # Configure CORS for frontend communication
-cors_config = {
-    "origins": app.config.get('CORS_ALLOWED_ORIGINS', []),
-    "methods": app.config.get('CORS_ALLOW_METHODS', ["GET", "POST", "PUT", "DELETE", "OPTIONS"]),
-    "allow_headers": app.config.get('CORS_ALLOW_HEADERS', ["Content-Type", "Authorization"])
+# Origins and headers are fixed at startup, so the hook below only has to
+# look up the request Origin and copy precomputed values
+_CORS_ORIGINS = frozenset(app.config.get('CORS_ALLOWED_ORIGINS', []))
+_CORS_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Methods': ', '.join(sorted(
+        app.config.get('CORS_ALLOW_METHODS', ["GET", "POST", "PUT", "DELETE", "OPTIONS"])
+    )),
+    'Access-Control-Allow-Headers': ', '.join(
+        app.config.get('CORS_ALLOW_HEADERS', ["Content-Type", "Authorization"])
+    )
 }
-CORS(app, resources={r"/api/*": cors_config})
+
+
+@app.after_request
+def add_cors_headers(response):
+    """Attach CORS headers to /api/* responses for allowed origins."""
+    origin = request.headers.get('Origin')
+    if not origin or not request.path.startswith('/api'):
+        return response
+    if '*' in _CORS_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = '*'
+    elif origin in _CORS_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.vary.add('Origin')
+    else:
+        return response
+    if request.method == 'OPTIONS' and 'Access-Control-Request-Method' in request.headers:
+        response.headers.update(_CORS_PREFLIGHT_HEADERS)
+    return response
+
+
+# Short-lived cache for the list endpoints that clients poll
+cache = Cache(app)
 
 print("[APP] Flask application initialized")
 print(f"[APP] CORS enabled for: {app.config.get('CORS_ALLOWED_ORIGINS', [])}")
@@ -61,64 +149,205 @@ def init_database_once():
         raise
 
 
-# Register startup hook with Flask-version compatibility
-if hasattr(app, 'before_serving'):
-    app.before_serving(init_database_once)
-else:
-    @app.before_request
-    def init_database_on_first_request():
-        if not getattr(app, '_db_initialized', False):
-            init_database_once()
-            app._db_initialized = True
+# Run schema setup once at import time so no request pays a first-run check
+init_database_once()
+
+
+# Values of ?raw= that switch a response to unwrapped JSON
+_TRUTHY = frozenset({'1', 'true', 'yes'})
+
+# Alert reasons for violations reported by the browser
+_REASON_MAP = {
+    'left_fullscreen': 'Left fullscreen mode',
+    'switched_tab': 'Switched tab or window',
+    'window_blur': 'Window lost focus',
+    'no_face': 'No face detected',
+    'multiple_faces': 'Multiple faces detected'
+}
+
+_EXAM_ID_BY_CODE_SQL = 'SELECT id FROM exams WHERE code = ?'
+
+_ALL_SUBMISSIONS_SQL = f'SELECT {SUBMISSION_COLUMNS} FROM submissions ORDER BY submitted_at DESC'
+_SUBMISSIONS_BY_STUDENT_SQL = (
+    f'SELECT {SUBMISSION_COLUMNS} FROM submissions WHERE student_id = ? ORDER BY submitted_at DESC'
+)
+# Submissions are append-only, so row count plus newest id identifies a list version
+_ALL_SUBMISSIONS_VERSION_SQL = 'SELECT COUNT(*) AS row_count, MAX(id) AS last_id FROM submissions'
+_SUBMISSIONS_BY_STUDENT_VERSION_SQL = (
+    'SELECT COUNT(*) AS row_count, MAX(id) AS last_id FROM submissions WHERE student_id = :student_id'
+)
+
+# Opt-in streaming format for the large list endpoints
+_NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Static parts of the liveness responses; see _health_response
+_HEALTH_PAYLOAD = {
+    'status': 'success',
+    'message': 'ProctorGuard Backend is running',
+    'service': 'ProctorGuard API v1.0'
+}
+_API_HEALTH_PAYLOAD = {
+    'status': 'healthy',
+    'message': 'ProctorGuard API is operational'
+}
+
+
+def _cache_version(resource: str) -> str:
+    """Return the current cache generation for ``resource``, starting one if needed."""
+    key = f"version:{resource}"
+    version = cache.get(key)
+    if version is None:
+        # A lost counter must not revive entries cached under an older one
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=0):
+            version = cache.get(key) or version
+    return version
+
+
+def invalidate_list_cache(*resources: str) -> None:
+    """
+    Retire cached GET responses after a write so readers see new rows
+
+    Args:
+        resources: Cache groups to refresh ('students', 'exams', 'alerts');
+            entries of other groups stay cached
+    """
+    for resource in resources:
+        cache.set(f"version:{resource}", uuid.uuid4().hex, timeout=0)
+
+
+def cached_json(resource: str):
+    """
+    Serve repeat GETs from the already-serialized response body
+
+    Successful responses are stored as (etag, bytes) so cache hits skip the
+    query, the JSON encoder and the hashing; If-None-Match is answered with 304.
+    Keys carry the generation of ``resource``, which invalidate_list_cache bumps.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache_key = (
+                f"json:{resource}:{_cache_version(resource)}:"
+                f"{request.path}?{urlencode(sorted(request.args.items(multi=True)))}"
+            )
+            entry = cache.get(cache_key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                entry = (hashlib.blake2b(body, digest_size=16).hexdigest(), body)
+                cache.set(cache_key, entry)
+
+            etag, body = entry
+            response = app.response_class(body, 200, mimetype='application/json')
+            response.set_etag(etag)
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def versioned_etag(version_sql: str):
+    """
+    Tag list responses with a weak ETag built from ``version_sql``, a cheap
+    COUNT/MAX query over append-only rows, and answer a matching
+    If-None-Match with 304 before the list itself is queried.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version = fetch_one(version_sql, kwargs)
+            except Exception as e:
+                logger.error("Failed to compute list version: %s", e)
+                return view(*args, **kwargs)
+
+            representation = 'ndjson' if wants_ndjson() else 'raw' if wants_raw_response() else 'json'
+            etag = f"{version['row_count']}-{version['last_id'] or 0}-{representation}"
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            # Clients may keep the list but must revalidate before reusing it
+            response.cache_control.no_cache = True
+            response.vary.add('Accept')
+            return response
+        return wrapper
+    return decorator
 
 
 def wants_raw_response() -> bool:
     """Return True when the caller asks for raw JSON without wrapper fields."""
-    raw_value = request.args.get('raw', '')
-    return str(raw_value).strip().lower() in {'1', 'true', 'yes'}
+    return request.args.get('raw', '').strip().lower() in _TRUTHY
+
+
+def wants_ndjson() -> bool:
+    """Return True when the caller prefers newline-delimited JSON over a JSON array."""
+    return request.accept_mimetypes.best_match(['application/json', _NDJSON_MIMETYPE]) == _NDJSON_MIMETYPE
 
 
-def resolve_student_id(student_id_value):
-    """Coerce student_id to int when possible, otherwise raise ValueError."""
-    if isinstance(student_id_value, int):
-        return student_id_value
-    if isinstance(student_id_value, str) and student_id_value.isdigit():
-        return int(student_id_value)
-    if isinstance(student_id_value, float) and student_id_value.is_integer():
-        return int(student_id_value)
-    raise ValueError('student_id must be a numeric value')
+def ndjson_response(rows):
+    """Stream an iterable of rows as NDJSON, encoding each row as it is produced."""
+    def generate():
+        try:
+            for row in rows:
+                yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+        except Exception as e:
+            # Headers are already sent; all we can do is end the stream early
+            logger.error("NDJSON stream aborted: %s", e)
+
+    return app.response_class(stream_with_context(generate()), mimetype=_NDJSON_MIMETYPE)
+
+
+@lru_cache(maxsize=2048)
+def _exam_id_by_code(code: str) -> int:
+    """Look up an exam id by code; raising on a miss keeps misses out of the cache."""
+    exam = fetch_one(_EXAM_ID_BY_CODE_SQL, (code,))
+    if not exam:
+        raise LookupError(code)
+    return int(exam['id'])
 
 
 def resolve_exam_id(exam_id_value):
     """Resolve exam_id from int or exam code string."""
-    if isinstance(exam_id_value, int):
-        return exam_id_value
-    if isinstance(exam_id_value, float) and exam_id_value.is_integer():
-        return int(exam_id_value)
-    if isinstance(exam_id_value, str):
-        exam_id_value = exam_id_value.strip()
-        if exam_id_value.isdigit():
-            return int(exam_id_value)
-        if exam_id_value:
-            exam = fetch_one('SELECT id FROM exams WHERE code = ?', (exam_id_value,))
-            if exam:
-                return int(exam['id'])
-            raise ValueError('Exam code not found')
-    raise ValueError('exam_id is required')
-
-
-def normalize_submission_row(row: dict) -> dict:
-    """Parse JSON answers from the database for API output."""
-    if not row:
-        return row
-    answers_value = row.get('answers')
+    exam_ref = normalize_exam_ref(exam_id_value)
+    if isinstance(exam_ref, int):
+        return exam_ref
+    try:
+        return _exam_id_by_code(exam_ref)
+    except LookupError:
+        raise ValueError('Exam code not found') from None
+
+
+def parse_answers(answers_value):
+    """
+    Split a submission's answers into (value to echo, JSON text to store).
+
+    Answers sent as a JSON string are validated once and stored verbatim,
+    so add_submission doesn't re-encode them; invalid strings become {}.
+    Strings with raw line breaks are re-encoded compactly, since the list
+    endpoints copy stored answers straight into (NDJSON) responses.
+    """
     if isinstance(answers_value, str):
         try:
-            row['answers'] = json.loads(answers_value)
-        except json.JSONDecodeError:
-            row['answers'] = {}
-    if 'flagged' in row:
-        row['flagged'] = bool(row['flagged'])
+            parsed = orjson.loads(answers_value)
+        except orjson.JSONDecodeError:
+            return {}, None
+        if '\n' in answers_value or '\r' in answers_value:
+            return parsed, None
+        return parsed, answers_value
+    return answers_value, None
+
+
+def normalize_screenshot_row(row: dict) -> dict:
+    """Add the screenshot URL and base64-encode any inlined BLOB data for API output."""
+    row['image_url'] = f"/api/violation-screenshots/{row['screenshot_id']}"
+    if isinstance(row.get('image_data'), bytes):
+        row['image_data'] = base64.b64encode(row['image_data']).decode('ascii')
     return row
 
 
@@ -126,6 +355,19 @@ def normalize_submission_row(row: dict) -> dict:
 # API ROUTES
 # ============================================================================
 
+_health_bodies = {}
+
+
+def _health_response(payload: dict):
+    """Return ``payload`` plus a timestamp as JSON, re-encoding at most once per second."""
+    now = int(time.time())
+    cached = _health_bodies.get(id(payload))
+    if cached is None or cached[0] != now:
+        cached = (now, orjson.dumps({**payload, 'timestamp': datetime.now()}))
+        _health_bodies[id(payload)] = cached
+    return app.response_class(cached[1], status=200, mimetype='application/json')
+
+
 @app.route('/', methods=['GET'])
 def health_check():
     """
@@ -134,13 +376,8 @@ def health_check():
     Returns:
         JSON: Server status and timestamp
     """
-    print("[ROUTE] GET / - Health check")
-    return jsonify({
-        'status': 'success',
-        'message': 'ProctorGuard Backend is running',
-        'timestamp': datetime.now().isoformat(),
-        'service': 'ProctorGuard API v1.0'
-    }), 200
+    logger.debug("GET / - Health check")
+    return _health_response(_HEALTH_PAYLOAD)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -151,12 +388,8 @@ def api_health():
     Returns:
         JSON: API status
     """
-    print("[ROUTE] GET /api/health - API health check")
-    return jsonify({
-        'status': 'healthy',
-        'message': 'ProctorGuard API is operational',
-        'timestamp': datetime.now().isoformat()
-    }), 200
+    logger.debug("GET /api/health - API health check")
+    return _health_response(_API_HEALTH_PAYLOAD)
 
 
 # ============================================================================
@@ -177,23 +410,24 @@ def create_student():
         JSON: Created student details
     """
     try:
-        print("[ROUTE] POST /api/students - Create student")
-        data = request.get_json()
-        
-        if not data or not data.get('name') or not data.get('email'):
-            print("[ERROR] Invalid student data provided")
+        logger.debug("POST /api/students - Create student")
+        try:
+            data = StudentIn.model_validate_json(request.get_data())
+        except ValidationError as exc:
+            logger.debug("Invalid student data provided")
             return jsonify({
                 'status': 'error',
-                'message': 'Name and email are required'
+                'message': validation_message(exc, 'Name and email are required')
             }), 400
         
-        student_id = add_student(
-            name=data['name'],
-            email=data['email'],
-            exam_id=data.get('exam_id')
+        student = add_student(
+            name=data.name,
+            email=data.email,
+            exam_id=data.exam_id
         )
+        student_id = student['id']
+        invalidate_list_cache('students')
 
-        student = fetch_one('SELECT * FROM students WHERE id = ?', (student_id,))
         if wants_raw_response():
             return jsonify(student), 201
 
@@ -204,9 +438,10 @@ def create_student():
             'data': student
         }), 201
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to create student: {e}")
-        logger.error(f"Failed to create student: {e}")
+        logger.error("Failed to create student: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to create student'
@@ -214,6 +449,7 @@ def create_student():
 
 
 @app.route('/api/students/<int:student_id>', methods=['GET'])
+@cached_json('students')
 def get_student(student_id):
     """
     Get student details by ID
@@ -225,14 +461,14 @@ def get_student(student_id):
         JSON: Student details
     """
     try:
-        print(f"[ROUTE] GET /api/students/{student_id} - Get student")
+        logger.debug("GET /api/students/%s - Get student", student_id)
         student = fetch_one(
             'SELECT * FROM students WHERE id = ?',
             (student_id,)
         )
         
         if not student:
-            print(f"[ERROR] Student {student_id} not found")
+            logger.debug("Student %s not found", student_id)
             return jsonify({
                 'status': 'error',
                 'message': 'Student not found'
@@ -247,8 +483,7 @@ def get_student(student_id):
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get student: {e}")
-        logger.error(f"Failed to get student: {e}")
+        logger.error("Failed to get student: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve student'
@@ -256,6 +491,7 @@ def get_student(student_id):
 
 
 @app.route('/api/students', methods=['GET'])
+@cached_json('students')
 def get_all_students():
     """
     Get all students
@@ -264,7 +500,7 @@ def get_all_students():
         JSON: List of all students
     """
     try:
-        print("[ROUTE] GET /api/students - Get all students")
+        logger.debug("GET /api/students - Get all students")
         students = fetch_all('SELECT * FROM students')
         
         if wants_raw_response():
@@ -277,8 +513,7 @@ def get_all_students():
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get all students: {e}")
-        logger.error(f"Failed to get all students: {e}")
+        logger.error("Failed to get all students: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve students'
@@ -303,24 +538,25 @@ def create_exam():
         JSON: Created exam details
     """
     try:
-        print("[ROUTE] POST /api/exams - Create exam")
-        data = request.get_json()
-        
-        if not data or not data.get('name'):
-            print("[ERROR] Invalid exam data provided")
+        logger.debug("POST /api/exams - Create exam")
+        try:
+            data = ExamIn.model_validate_json(request.get_data())
+        except ValidationError as exc:
+            logger.debug("Invalid exam data provided")
             return jsonify({
                 'status': 'error',
-                'message': 'Exam name is required'
+                'message': validation_message(exc, 'Exam name is required')
             }), 400
         
-        exam_id = add_exam(
-            name=data['name'],
-            duration=data.get('duration', 0),
-            total_questions=data.get('total_questions', 0),
-            code=data.get('code') or data.get('exam_code')
+        exam = add_exam(
+            name=data.name,
+            duration=data.duration,
+            total_questions=data.total_questions,
+            code=data.code
         )
+        exam_id = exam['id']
+        invalidate_list_cache('exams')
 
-        exam = fetch_one('SELECT * FROM exams WHERE id = ?', (exam_id,))
         if wants_raw_response():
             return jsonify(exam), 201
 
@@ -331,9 +567,10 @@ def create_exam():
             'data': exam
         }), 201
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to create exam: {e}")
-        logger.error(f"Failed to create exam: {e}")
+        logger.error("Failed to create exam: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to create exam'
@@ -341,6 +578,7 @@ def create_exam():
 
 
 @app.route('/api/exams/<int:exam_id>', methods=['GET'])
+@cached_json('exams')
 def get_exam(exam_id):
     """
     Get exam details by ID
@@ -352,14 +590,14 @@ def get_exam(exam_id):
         JSON: Exam details
     """
     try:
-        print(f"[ROUTE] GET /api/exams/{exam_id} - Get exam")
+        logger.debug("GET /api/exams/%s - Get exam", exam_id)
         exam = fetch_one(
             'SELECT * FROM exams WHERE id = ?',
             (exam_id,)
         )
         
         if not exam:
-            print(f"[ERROR] Exam {exam_id} not found")
+            logger.debug("Exam %s not found", exam_id)
             return jsonify({
                 'status': 'error',
                 'message': 'Exam not found'
@@ -374,8 +612,7 @@ def get_exam(exam_id):
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get exam: {e}")
-        logger.error(f"Failed to get exam: {e}")
+        logger.error("Failed to get exam: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve exam'
@@ -383,6 +620,7 @@ def get_exam(exam_id):
 
 
 @app.route('/api/exams', methods=['GET'])
+@cached_json('exams')
 def get_all_exams():
     """
     Get all exams
@@ -391,7 +629,7 @@ def get_all_exams():
         JSON: List of all exams
     """
     try:
-        print("[ROUTE] GET /api/exams - Get all exams")
+        logger.debug("GET /api/exams - Get all exams")
         exams = fetch_all('SELECT * FROM exams')
         
         if wants_raw_response():
@@ -404,8 +642,7 @@ def get_all_exams():
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get all exams: {e}")
-        logger.error(f"Failed to get all exams: {e}")
+        logger.error("Failed to get all exams: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve exams'
@@ -431,30 +668,30 @@ def create_alert():
         JSON: Created alert details
     """
     try:
-        print("[ROUTE] POST /api/alerts - Create alert")
-        data = request.get_json()
-        
-        if not data or not data.get('student_id') or not data.get('exam_id') or not data.get('reason'):
-            print("[ERROR] Invalid alert data provided")
+        logger.debug("POST /api/alerts - Create alert")
+        try:
+            data = AlertIn.model_validate_json(request.get_data())
+        except ValidationError as exc:
+            logger.debug("Invalid alert data provided")
             return jsonify({
                 'status': 'error',
-                'message': 'student_id, exam_id, and reason are required'
+                'message': validation_message(exc, 'student_id, exam_id, and reason are required')
             }), 400
         
         try:
-            resolved_student_id = resolve_student_id(data['student_id'])
-            resolved_exam_id = resolve_exam_id(data['exam_id'])
+            resolved_exam_id = resolve_exam_id(data.exam_id)
         except ValueError as exc:
             return jsonify({'status': 'error', 'message': str(exc)}), 400
 
-        alert_id = add_alert(
-            student_id=resolved_student_id,
+        alert = add_alert(
+            student_id=data.student_id,
             exam_id=resolved_exam_id,
-            reason=data['reason'],
-            severity=data.get('severity', 'warning')
+            reason=data.reason,
+            severity=data.severity
         )
+        alert_id = alert['id']
+        invalidate_list_cache('alerts')
 
-        alert = fetch_one('SELECT * FROM alerts WHERE id = ?', (alert_id,))
         if wants_raw_response():
             return jsonify(alert), 201
 
@@ -465,9 +702,10 @@ def create_alert():
             'data': alert
         }), 201
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to create alert: {e}")
-        logger.error(f"Failed to create alert: {e}")
+        logger.error("Failed to create alert: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to create alert'
@@ -475,6 +713,7 @@ def create_alert():
 
 
 @app.route('/api/alerts/student/<int:student_id>', methods=['GET'])
+@cached_json('alerts')
 def get_student_alerts(student_id):
     """
     Get all alerts for a specific student
@@ -486,7 +725,7 @@ def get_student_alerts(student_id):
         JSON: List of alerts for the student
     """
     try:
-        print(f"[ROUTE] GET /api/alerts/student/{student_id} - Get student alerts")
+        logger.debug("GET /api/alerts/student/%s - Get student alerts", student_id)
         alerts = fetch_all(
             'SELECT * FROM alerts WHERE student_id = ? ORDER BY timestamp DESC',
             (student_id,)
@@ -502,8 +741,7 @@ def get_student_alerts(student_id):
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get student alerts: {e}")
-        logger.error(f"Failed to get student alerts: {e}")
+        logger.error("Failed to get student alerts: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve alerts'
@@ -511,6 +749,7 @@ def get_student_alerts(student_id):
 
 
 @app.route('/api/alerts', methods=['GET'])
+@cached_json('alerts')
 def get_all_alerts():
     """
     Get all alerts
@@ -519,7 +758,7 @@ def get_all_alerts():
         JSON: List of all alerts
     """
     try:
-        print("[ROUTE] GET /api/alerts - Get all alerts")
+        logger.debug("GET /api/alerts - Get all alerts")
         alerts = fetch_all('SELECT * FROM alerts ORDER BY timestamp DESC')
         
         if wants_raw_response():
@@ -532,8 +771,7 @@ def get_all_alerts():
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get all alerts: {e}")
-        logger.error(f"Failed to get all alerts: {e}")
+        logger.error("Failed to get all alerts: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve alerts'
@@ -555,45 +793,48 @@ def log_violation():
             return jsonify({'status': 'error', 'message': str(exc)}), 400
 
         violation_type = str(data['violation_type']).strip()
-        reason_map = {
-            'left_fullscreen': 'Left fullscreen mode',
-            'switched_tab': 'Switched tab or window',
-            'window_blur': 'Window lost focus',
-            'no_face': 'No face detected',
-            'multiple_faces': 'Multiple faces detected'
-        }
-        reason = reason_map.get(violation_type, 'Violation detected')
+        reason = _REASON_MAP.get(violation_type, 'Violation detected')
 
-        alert_id = add_alert(
-            student_id=resolved_student_id,
-            exam_id=resolved_exam_id,
-            reason=reason,
-            severity='critical'
-        )
-
-        # Save screenshot if provided
-        image_data = data.get('image')
-        if image_data:
-            try:
-                add_violation_screenshot(
-                    alert_id=alert_id,
-                    student_id=resolved_student_id,
-                    exam_id=resolved_exam_id,
-                    image_data=image_data,
-                    violation_type=violation_type
-                )
-                print(f"[ROUTE] Screenshot saved for alert {alert_id}")
-            except Exception as img_err:
-                print(f"[WARN] Failed to save screenshot: {img_err}")
+        # Alert and screenshot share one transaction (one commit)
+        with transaction() as conn:
+            alert = add_alert(
+                student_id=resolved_student_id,
+                exam_id=resolved_exam_id,
+                reason=reason,
+                severity='critical',
+                conn=conn
+            )
+            alert_id = alert['id']
+
+            # Save screenshots if provided (``image`` and/or an ``images`` list)
+            images = data.get('images')
+            images = list(images) if isinstance(images, list) else []
+            if data.get('image'):
+                images.insert(0, data['image'])
+            if images:
+                try:
+                    add_violation_screenshots_bulk(
+                        [
+                            (alert_id, resolved_student_id, resolved_exam_id,
+                             decode_screenshot(image_data), violation_type)
+                            for image_data in images if image_data
+                        ],
+                        conn=conn
+                    )
+                    logger.debug("Screenshots saved for alert %s", alert_id)
+                except Exception as img_err:
+                    logger.warning("Failed to save screenshot: %s", img_err)
+        invalidate_list_cache('alerts')
 
         response = {'success': True, 'alert_id': alert_id}
         if wants_raw_response():
             return jsonify(response), 201
 
         return jsonify({'status': 'success', 'data': response}), 201
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to log violation: {e}")
-        logger.error(f"Failed to log violation: {e}")
+        logger.error("Failed to log violation: %s", e)
         return jsonify({'status': 'error', 'message': 'Failed to log violation'}), 500
 
 
@@ -601,14 +842,84 @@ def log_violation():
 # FRAME ANALYSIS ENDPOINTS
 # ============================================================================
 
+def store_frame_alert(result: dict, student_id: int, exam_id: int):
+    """
+    Record the alert and screenshot for an analysed frame
+
+    Args:
+        result: Output of the frame analysis
+        student_id: Resolved student ID
+        exam_id: Resolved exam ID
+
+    Returns:
+        dict: The stored alert, or None when the frame raised no alert
+    """
+    if not result.get('alert'):
+        return None
+
+    compressed_image = result.get('compressed_image')
+    # Alert and screenshot share one transaction (one commit)
+    with transaction() as conn:
+        alert = add_alert(
+            student_id=student_id,
+            exam_id=exam_id,
+            reason=result.get('reason') or 'Suspicious activity detected',
+            severity=result.get('severity') or 'warning',
+            conn=conn
+        )
+
+        if compressed_image:
+            add_violation_screenshot(
+                alert_id=alert['id'],
+                student_id=student_id,
+                exam_id=exam_id,
+                image_data=compressed_image,
+                violation_type=result.get('violation_type') or 'frame_alert',
+                conn=conn
+            )
+    invalidate_list_cache('alerts')
+    return alert
+
+
+def store_late_frame_alert(student_id: int, exam_id: int):
+    """Build a done-callback that stores the alert of a frame that outlived its request."""
+    def callback(future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            with app.app_context():
+                alert = store_frame_alert(future.result(), student_id, exam_id)
+            if alert:
+                logger.info("Stored late frame alert %s for student %s", alert['id'], student_id)
+        except Exception as e:
+            logger.error("Failed to store late frame alert: %s", e)
+    return callback
+
+
 @app.route('/api/analyze-frame', methods=['POST'])
 def analyze_frame_endpoint():
-    """Analyze a webcam frame and optionally record violations with screenshots."""
+    """
+    Analyze a webcam frame and optionally record violations with screenshots.
+
+    Accepts either JSON with a base64 ``image`` field, or the raw image bytes
+    (``Content-Type: image/jpeg`` etc.) with examId/studentId in the query string.
+    """
     try:
-        data = request.get_json() or {}
-        image_data = data.get('image')
-        exam_id_value = data.get('examId') or data.get('exam_id')
-        student_id_value = data.get('studentId') or data.get('student_id')
+        if request.mimetype.startswith('image/') or request.mimetype == 'application/octet-stream':
+            image_data = request.get_data(cache=False)
+            exam_id_value = request.args.get('examId') or request.args.get('exam_id')
+            student_id_value = request.args.get('studentId') or request.args.get('student_id')
+        else:
+            try:
+                data = FrameIn.model_validate_json(request.get_data(cache=False))
+            except ValidationError as exc:
+                return jsonify({
+                    'status': 'error',
+                    'message': validation_message(exc, 'image, examId, and studentId are required')
+                }), 400
+            image_data = data.image
+            exam_id_value = data.exam_id
+            student_id_value = data.student_id
 
         if not image_data or not exam_id_value or not student_id_value:
             return jsonify({'status': 'error', 'message': 'image, examId, and studentId are required'}), 400
@@ -619,43 +930,42 @@ def analyze_frame_endpoint():
         except ValueError as exc:
             return jsonify({'status': 'error', 'message': str(exc)}), 400
 
-        result = analyze_frame(image_data)
+        try:
+            future = submit_frame(image_data)
+        except FramePoolFull:
+            logger.warning("Frame pool full; rejecting frame for student %s", resolved_student_id)
+            return jsonify({'status': 'error', 'message': 'Frame analysis is busy, retry shortly'}), 503
+        try:
+            result = future.result(timeout=app.config.get('FRAME_ANALYSIS_TIMEOUT'))
+        except FrameTimeoutError:
+            # Drop frames still queued so overload can't build a backlog; a
+            # frame already running can't be stopped, so keep its alert
+            if not future.cancel():
+                future.add_done_callback(store_late_frame_alert(resolved_student_id, resolved_exam_id))
+            logger.warning("Frame analysis timed out for student %s", resolved_student_id)
+            return jsonify({'status': 'error', 'message': 'Frame analysis timed out'}), 503
         response = {
             'alert': bool(result.get('alert')),
             'reason': result.get('reason'),
             'severity': result.get('severity'),
             'violation_type': result.get('violation_type'),
-            'compressed_image': result.get('compressed_image')
+            'compressed_image': None
         }
+        # Screenshots travel as JPEG bytes; base64 is only for the JSON reply
+        compressed_image = result.get('compressed_image')
+        if compressed_image:
+            response['compressed_image'] = base64.b64encode(compressed_image).decode('ascii')
 
-        if response['alert']:
-            reason = response['reason'] or 'Suspicious activity detected'
-            severity = response['severity'] or 'warning'
-            violation_type = response['violation_type'] or 'frame_alert'
-
-            alert_id = add_alert(
-                student_id=resolved_student_id,
-                exam_id=resolved_exam_id,
-                reason=reason,
-                severity=severity
-            )
-
-            if response['compressed_image']:
-                add_violation_screenshot(
-                    alert_id=alert_id,
-                    student_id=resolved_student_id,
-                    exam_id=resolved_exam_id,
-                    image_data=response['compressed_image'],
-                    violation_type=violation_type
-                )
+        store_frame_alert(result, resolved_student_id, resolved_exam_id)
 
         if wants_raw_response():
             return jsonify(response), 200
 
         return jsonify({'status': 'success', 'data': response}), 200
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Frame analysis failed: {e}")
-        logger.error(f"Frame analysis failed: {e}")
+        logger.error("Frame analysis failed: %s", e)
         return jsonify({'status': 'error', 'message': 'Frame analysis failed'}), 500
 
 
@@ -663,26 +973,33 @@ def analyze_frame_endpoint():
 # UI ROUTES
 # ============================================================================
 
-@app.route('/ui', methods=['GET'])
+ui_bp = Blueprint('ui', __name__, url_prefix='/ui')
+
+
+@ui_bp.route('', methods=['GET'])
 def ui_dashboard():
     """Render admin dashboard UI"""
     try:
-        students_count = fetch_one('SELECT COUNT(*) AS count FROM students')
-        exams_count = fetch_one('SELECT COUNT(*) AS count FROM exams')
-        alerts_count = fetch_one('SELECT COUNT(*) AS count FROM alerts')
+        counts = fetch_one(
+            '''
+            SELECT
+                (SELECT COUNT(*) FROM students) AS students,
+                (SELECT COUNT(*) FROM exams) AS exams,
+                (SELECT COUNT(*) FROM alerts) AS alerts
+            '''
+        ) or {}
         stats = {
-            'students': (students_count or {}).get('count', 0),
-            'exams': (exams_count or {}).get('count', 0),
-            'alerts': (alerts_count or {}).get('count', 0)
+            'students': counts.get('students', 0),
+            'exams': counts.get('exams', 0),
+            'alerts': counts.get('alerts', 0)
         }
         return render_template('dashboard.html', title='Dashboard', stats=stats)
     except Exception as e:
-        print(f"[ERROR] UI dashboard failed: {e}")
-        logger.error(f"UI dashboard failed: {e}")
+        logger.error("UI dashboard failed: %s", e)
         return jsonify({'status': 'error', 'message': 'UI failed to load'}), 500
 
 
-@app.route('/ui/students', methods=['GET', 'POST'])
+@ui_bp.route('/students', methods=['GET', 'POST'])
 def ui_students():
     """Render and manage students UI"""
     try:
@@ -692,17 +1009,19 @@ def ui_students():
             exam_id = request.form.get('exam_id', '').strip() or None
             if name and email:
                 add_student(name=name, email=email, exam_id=exam_id)
-            return redirect(url_for('ui_students'))
+                invalidate_list_cache('students')
+            return redirect(url_for('ui.ui_students'))
 
         students = fetch_all('SELECT * FROM students ORDER BY created_at DESC')
         return render_template('students.html', title='Students', students=students)
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] UI students failed: {e}")
-        logger.error(f"UI students failed: {e}")
+        logger.error("UI students failed: %s", e)
         return jsonify({'status': 'error', 'message': 'UI failed to load'}), 500
 
 
-@app.route('/ui/exams', methods=['GET', 'POST'])
+@ui_bp.route('/exams', methods=['GET', 'POST'])
 def ui_exams():
     """Render and manage exams UI"""
     try:
@@ -713,28 +1032,32 @@ def ui_exams():
             code = request.form.get('code', '').strip() or None
             if name:
                 add_exam(name=name, duration=duration, total_questions=total_questions, code=code)
-            return redirect(url_for('ui_exams'))
+                invalidate_list_cache('exams')
+            return redirect(url_for('ui.ui_exams'))
 
         exams = fetch_all('SELECT * FROM exams ORDER BY created_at DESC')
         return render_template('exams.html', title='Exams', exams=exams)
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] UI exams failed: {e}")
-        logger.error(f"UI exams failed: {e}")
+        logger.error("UI exams failed: %s", e)
         return jsonify({'status': 'error', 'message': 'UI failed to load'}), 500
 
 
-@app.route('/ui/alerts', methods=['GET'])
+@ui_bp.route('/alerts', methods=['GET'])
 def ui_alerts():
     """Render alerts UI"""
     try:
         alerts = fetch_all('SELECT * FROM alerts ORDER BY timestamp DESC')
         return render_template('alerts.html', title='Alerts', alerts=alerts)
     except Exception as e:
-        print(f"[ERROR] UI alerts failed: {e}")
-        logger.error(f"UI alerts failed: {e}")
+        logger.error("UI alerts failed: %s", e)
         return jsonify({'status': 'error', 'message': 'UI failed to load'}), 500
 
 
+app.register_blueprint(ui_bp)
+
+
 # ============================================================================
 # SUBMISSIONS ENDPOINTS
 # ============================================================================
@@ -754,11 +1077,11 @@ def create_submission():
         JSON: Created submission details
     """
     try:
-        print("[ROUTE] POST /api/submissions - Create submission")
+        logger.debug("POST /api/submissions - Create submission")
         data = request.get_json()
         
         if not data or not data.get('student_id') or not data.get('exam_id'):
-            print("[ERROR] Invalid submission data provided")
+            logger.debug("Invalid submission data provided")
             return jsonify({
                 'status': 'error',
                 'message': 'student_id and exam_id are required'
@@ -770,25 +1093,19 @@ def create_submission():
         except ValueError as exc:
             return jsonify({'status': 'error', 'message': str(exc)}), 400
 
-        answers_value = data.get('answers', {})
-        if isinstance(answers_value, str):
-            try:
-                answers_value = json.loads(answers_value)
-            except json.JSONDecodeError:
-                answers_value = {}
+        answers_value, answers_json = parse_answers(data.get('answers', {}))
 
         flagged_value = bool(data.get('flagged', False))
 
-        submission_id = add_submission(
+        submission = add_submission(
             student_id=resolved_student_id,
             exam_id=resolved_exam_id,
             answers=answers_value,
+            answers_json=answers_json,
             score=data.get('score', 0),
             flagged=flagged_value
         )
-
-        submission = fetch_one('SELECT * FROM submissions WHERE id = ?', (submission_id,))
-        submission = normalize_submission_row(submission)
+        submission_id = submission['id']
 
         if wants_raw_response():
             return jsonify(submission), 201
@@ -800,9 +1117,10 @@ def create_submission():
             'data': submission
         }), 201
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to create submission: {e}")
-        logger.error(f"Failed to create submission: {e}")
+        logger.error("Failed to create submission: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to create submission'
@@ -828,24 +1146,17 @@ def submit_exam():
         except ValueError as exc:
             return jsonify({'status': 'error', 'message': str(exc)}), 400
 
-        answers_value = data.get('answers', {})
-        if isinstance(answers_value, str):
-            try:
-                answers_value = json.loads(answers_value)
-            except json.JSONDecodeError:
-                answers_value = {}
+        answers_value, answers_json = parse_answers(data.get('answers', {}))
 
-        submission_id = add_submission(
+        submission = add_submission(
             student_id=resolved_student_id,
             exam_id=resolved_exam_id,
             answers=answers_value,
+            answers_json=answers_json,
             score=data.get('score', 0),
             flagged=bool(data.get('flagged', False))
         )
 
-        submission = fetch_one('SELECT * FROM submissions WHERE id = ?', (submission_id,))
-        submission = normalize_submission_row(submission)
-
         if wants_raw_response():
             return jsonify(submission), 201
 
@@ -853,13 +1164,15 @@ def submit_exam():
             'status': 'success',
             'data': submission
         }), 201
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to submit exam: {e}")
-        logger.error(f"Failed to submit exam: {e}")
+        logger.error("Failed to submit exam: %s", e)
         return jsonify({'status': 'error', 'message': 'Failed to submit exam'}), 500
 
 
 @app.route('/api/submissions/student/<int:student_id>', methods=['GET'])
+@versioned_etag(_SUBMISSIONS_BY_STUDENT_VERSION_SQL)
 def get_student_submissions(student_id):
     """
     Get all submissions for a specific student
@@ -871,13 +1184,13 @@ def get_student_submissions(student_id):
         JSON: List of submissions for the student
     """
     try:
-        print(f"[ROUTE] GET /api/submissions/student/{student_id} - Get student submissions")
-        submissions = fetch_all(
-            'SELECT * FROM submissions WHERE student_id = ? ORDER BY submitted_at DESC',
-            (student_id,)
-        )
-        
-        submissions = [normalize_submission_row(row) for row in submissions]
+        logger.debug("GET /api/submissions/student/%s - Get student submissions", student_id)
+        if wants_ndjson():
+            return ndjson_response(
+                iter_rows(_SUBMISSIONS_BY_STUDENT_SQL, (student_id,), row_factory=submission_row)
+            )
+
+        submissions = fetch_all(_SUBMISSIONS_BY_STUDENT_SQL, (student_id,), row_factory=submission_row)
 
         if wants_raw_response():
             return jsonify(submissions), 200
@@ -889,8 +1202,7 @@ def get_student_submissions(student_id):
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get student submissions: {e}")
-        logger.error(f"Failed to get student submissions: {e}")
+        logger.error("Failed to get student submissions: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve submissions'
@@ -898,6 +1210,7 @@ def get_student_submissions(student_id):
 
 
 @app.route('/api/submissions', methods=['GET'])
+@versioned_etag(_ALL_SUBMISSIONS_VERSION_SQL)
 def get_all_submissions():
     """
     Get all submissions
@@ -906,10 +1219,11 @@ def get_all_submissions():
         JSON: List of all submissions
     """
     try:
-        print("[ROUTE] GET /api/submissions - Get all submissions")
-        submissions = fetch_all('SELECT * FROM submissions ORDER BY submitted_at DESC')
-        
-        submissions = [normalize_submission_row(row) for row in submissions]
+        logger.debug("GET /api/submissions - Get all submissions")
+        if wants_ndjson():
+            return ndjson_response(iter_rows(_ALL_SUBMISSIONS_SQL, row_factory=submission_row))
+
+        submissions = fetch_all(_ALL_SUBMISSIONS_SQL, row_factory=submission_row)
 
         if wants_raw_response():
             return jsonify(submissions), 200
@@ -921,8 +1235,7 @@ def get_all_submissions():
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to get all submissions: {e}")
-        logger.error(f"Failed to get all submissions: {e}")
+        logger.error("Failed to get all submissions: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Failed to retrieve submissions'
@@ -931,23 +1244,35 @@ def get_all_submissions():
 
 @app.route('/api/violations-with-screenshots', methods=['GET'])
 def get_violations_with_screenshots():
-    """Return violations joined with screenshot evidence."""
+    """
+    Return violations joined with screenshot evidence.
+
+    Rows carry an ``image_url`` for fetching the screenshot on demand; pass
+    ``?include_images=1`` to also inline the base64 ``image_data``.
+    """
     try:
-        rows = fetch_all(
-            '''
-            SELECT 
-                alerts.id AS alert_id,
-                students.name AS student_name,
-                violation_screenshots.violation_type AS violation_type,
-                violation_screenshots.timestamp AS timestamp,
-                violation_screenshots.image_data AS image_data,
-                alerts.severity AS severity
-            FROM violation_screenshots
-            JOIN alerts ON alerts.id = violation_screenshots.alert_id
-            JOIN students ON students.id = violation_screenshots.student_id
-            ORDER BY violation_screenshots.timestamp DESC
-            '''
+        image_column = (
+            'violation_screenshots.image_data AS image_data,'
+            if request.args.get('include_images', '').strip().lower() in _TRUTHY else ''
         )
+        query = f'''
+        SELECT 
+            violation_screenshots.id AS screenshot_id,
+            alerts.id AS alert_id,
+            students.name AS student_name,
+            violation_screenshots.violation_type AS violation_type,
+            violation_screenshots.timestamp AS timestamp,
+            {image_column}
+            alerts.severity AS severity
+        FROM violation_screenshots
+        JOIN alerts ON alerts.id = violation_screenshots.alert_id
+        JOIN students ON students.id = violation_screenshots.student_id
+        ORDER BY violation_screenshots.timestamp DESC
+        '''
+        if wants_ndjson():
+            return ndjson_response(map(normalize_screenshot_row, iter_rows(query)))
+
+        rows = [normalize_screenshot_row(row) for row in fetch_all(query)]
 
         if wants_raw_response():
             return jsonify(rows), 200
@@ -958,11 +1283,33 @@ def get_violations_with_screenshots():
             'data': rows
         }), 200
     except Exception as e:
-        print(f"[ERROR] Failed to get violations with screenshots: {e}")
-        logger.error(f"Failed to get violations with screenshots: {e}")
+        logger.error("Failed to get violations with screenshots: %s", e)
         return jsonify({'status': 'error', 'message': 'Failed to retrieve violations'}), 500
 
 
+@app.route('/api/violation-screenshots/<int:screenshot_id>', methods=['GET'])
+def get_violation_screenshot(screenshot_id):
+    """Serve one stored screenshot as an image."""
+    try:
+        row = fetch_one(
+            'SELECT image_data FROM violation_screenshots WHERE id = ?',
+            (screenshot_id,)
+        )
+        image_data = decode_screenshot(row['image_data']) if row else None
+        if not isinstance(image_data, bytes):
+            return jsonify({'status': 'error', 'message': 'Screenshot not found'}), 404
+
+        mimetype = 'image/png' if image_data.startswith(b'\x89PNG') else 'image/jpeg'
+        response = app.response_class(image_data, mimetype=mimetype)
+        # Screenshots never change once written
+        response.cache_control.private = True
+        response.cache_control.max_age = 86400
+        return response
+    except Exception as e:
+        logger.error("Failed to get violation screenshot: %s", e)
+        return jsonify({'status': 'error', 'message': 'Failed to retrieve screenshot'}), 500
+
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -978,7 +1325,7 @@ def not_found_error(error):
     Returns:
         JSON: Error response
     """
-    print(f"[ERROR] 404 Not Found: {request.path}")
+    logger.debug("404 Not Found: %s", request.path)
     return jsonify({
         'status': 'error',
         'message': 'Resource not found',
@@ -997,14 +1344,31 @@ def internal_error(error):
     Returns:
         JSON: Error response
     """
-    print(f"[ERROR] 500 Internal Server Error: {error}")
-    logger.error(f"Internal server error: {error}")
+    logger.error("Internal server error: %s", error)
     return jsonify({
         'status': 'error',
         'message': 'Internal server error'
     }), 500
 
 
+@app.errorhandler(413)
+def request_too_large_error(error):
+    """
+    Handle 413 Request Entity Too Large errors
+    
+    Args:
+        error: The error object
+    
+    Returns:
+        JSON: Error response
+    """
+    logger.debug("413 Request Entity Too Large: %s", request.path)
+    return jsonify({
+        'status': 'error',
+        'message': 'Request body too large'
+    }), 413
+
+
 @app.errorhandler(400)
 def bad_request_error(error):
     """
@@ -1016,7 +1380,7 @@ def bad_request_error(error):
     Returns:
         JSON: Error response
     """
-    print(f"[ERROR] 400 Bad Request: {error}")
+    logger.debug("400 Bad Request: %s", error)
     return jsonify({
         'status': 'error',
         'message': 'Bad request'
@@ -1045,5 +1409,5 @@ if __name__ == '__main__':
         )
     except Exception as e:
         print(f"\n[CRITICAL ERROR] Failed to start application: {e}")
-        logger.critical(f"Failed to start application: {e}")
+        logger.critical("Failed to start application: %s", e)
         raise
@@ -8,6 +8,8 @@ import json
 
 # Database configuration
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'database.db')
+# Connections kept open per worker process (match gunicorn threads per worker)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
 
 def _env_bool(name: str, default: bool = False) -> bool:
 	value = os.getenv(name)
@@ -51,11 +53,38 @@ CORS_ALLOW_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
 FLASK_PORT = int(os.getenv('FLASK_PORT', os.getenv('PORT', '5000')))
 FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
 
+# Template configuration
+# Only reload templates from disk while developing; compiled templates are
+# cached on disk so fresh workers skip the Jinja parse. With no directory set
+# Jinja uses its own per-user 0700 temp directory; point the dir somewhere
+# only this service can write, since cached bytecode is executed on load.
+TEMPLATES_AUTO_RELOAD = DEBUG
+JINJA_BYTECODE_CACHE = _env_bool('JINJA_BYTECODE_CACHE', default=True)
+JINJA_BYTECODE_CACHE_DIR = os.getenv('JINJA_BYTECODE_CACHE_DIR') or None
+
+# Response cache for list endpoints (SimpleCache is per worker process)
+CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', '5'))
+
 # Logging configuration
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# Quiet by default in production; per-request debug logging is opt-in
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG' if DEBUG else 'WARNING')
 
 # ProctorGuard specific settings
 MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+MAX_CONTENT_LENGTH = MAX_UPLOAD_SIZE  # Flask rejects larger request bodies with 413
 ALLOWED_IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
 
+# Frame analysis runs in a thread pool per worker process, off the request threads
+FRAME_WORKERS = int(os.getenv('FRAME_WORKERS', str(os.cpu_count() or 1)))
+FRAME_ANALYSIS_TIMEOUT = float(os.getenv('FRAME_ANALYSIS_TIMEOUT', '2'))
+# Frames queued or running per worker process before new ones get a 503
+FRAME_MAX_PENDING = int(os.getenv('FRAME_MAX_PENDING', str(2 * FRAME_WORKERS)))
+
+# Optional ONNX face detector (e.g. a YOLO face model); needs onnxruntime
+# installed, otherwise frames use the bundled Haar cascade
+FACE_DETECTOR_MODEL = os.getenv('FACE_DETECTOR_MODEL', '')
+FACE_DETECTOR_PROVIDERS = _env_list('FACE_DETECTOR_PROVIDERS', ['CUDAExecutionProvider', 'CPUExecutionProvider'])
+FACE_DETECTOR_CONFIDENCE = float(os.getenv('FACE_DETECTOR_CONFIDENCE', '0.5'))
+
 print("[CONFIG] Configuration loaded successfully")
@@ -4,52 +4,218 @@ Uses OpenCV Haar cascades to detect faces and returns basic violation signals.
 """
 
 import base64
-from typing import Dict, Optional
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Union
 
 import cv2
 import numpy as np
 
+from config import (
+    FACE_DETECTOR_CONFIDENCE,
+    FACE_DETECTOR_MODEL,
+    FACE_DETECTOR_PROVIDERS,
+    FRAME_MAX_PENDING,
+    FRAME_WORKERS,
+)
 
-def _decode_base64_image(image_base64: str) -> Optional[np.ndarray]:
-    """Decode a base64 image string into a BGR image matrix."""
+try:
+    import onnxruntime as ort
+except ImportError:  # optional accelerator; the Haar cascade covers its absence
+    ort = None
+
+try:
+    from gevent import monkey as gevent_monkey
+except ImportError:  # only present for GUNICORN_WORKER_CLASS=gevent
+    gevent_monkey = None
+
+
+_CASCADE_PATH = f"{cv2.data.haarcascades}haarcascade_frontalface_default.xml"
+
+# Parse the cascade XML once at import so a missing file fails at startup
+_FACE_CASCADE = cv2.CascadeClassifier(_CASCADE_PATH)
+if _FACE_CASCADE.empty():
+    raise RuntimeError(f"Failed to load Haar cascade from {_CASCADE_PATH}")
+
+if FACE_DETECTOR_MODEL and not os.path.isfile(FACE_DETECTOR_MODEL):
+    raise RuntimeError(f"FACE_DETECTOR_MODEL not found: {FACE_DETECTOR_MODEL}")
+
+# Frames are downscaled to this width before Haar detection
+_HAAR_WIDTH = 320
+# Smallest face to report, in source-frame pixels; scaled with the downscale
+_HAAR_MIN_FACE = 60
+
+# Used when the model input has dynamic height/width
+_ONNX_INPUT_SIZE = 320
+_ONNX_NMS_THRESHOLD = 0.45
+
+# Leading bytes of JPEG, PNG and GIF files (config.ALLOWED_IMAGE_EXTENSIONS)
+_IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PN", b"GIF")
+# Smaller than any real webcam frame; anything shorter is a broken upload
+_MIN_IMAGE_BYTES = 128
+
+# Optimized Huffman tables shave a few percent off each JPEG for little CPU
+_JPEG_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), 70, int(cv2.IMWRITE_JPEG_OPTIMIZE), 1]
+
+_onnx_session = None
+_frame_pool: Optional[ThreadPoolExecutor] = None
+_frame_slots: Optional[threading.BoundedSemaphore] = None
+_init_lock = threading.Lock()
+# Each pool thread gets its own cascade; sharing one across threads isn't documented as safe
+_thread_state = threading.local()
+
+
+def _reset_frame_pool() -> None:
+    """Forget a pool and detector session inherited from a parent process after fork."""
+    global _frame_pool, _frame_slots, _onnx_session, _init_lock
+    _frame_pool = None
+    _frame_slots = None
+    _onnx_session = None
+    _init_lock = threading.Lock()
+
+
+def _thread_cascade() -> cv2.CascadeClassifier:
+    """Return this thread's copy of the Haar cascade, loading it on first use."""
+    cascade = getattr(_thread_state, "cascade", None)
+    if cascade is None:
+        cascade = _thread_state.cascade = cv2.CascadeClassifier(_CASCADE_PATH)
+    return cascade
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_frame_pool)
+
+
+def _decode_base64_image(image_base64: Union[bytes, str]) -> Optional[np.ndarray]:
+    """Decode a base64 (or data URL) image into a BGR image matrix."""
     if not image_base64:
         return None
 
-    cleaned = image_base64.strip()
-    if "," in cleaned:
-        cleaned = cleaned.split(",", 1)[1]
-
     try:
-        image_bytes = base64.b64decode(cleaned)
+        if isinstance(image_base64, str):
+            image_base64 = image_base64.encode("ascii")
+        # Slice past any data URL prefix without copying; find() is -1 when absent.
+        # The non-validating decoder skips surrounding whitespace on its own.
+        payload = memoryview(image_base64)[image_base64.find(b",") + 1:]
+        image_bytes = base64.b64decode(payload, validate=False)
     except (ValueError, base64.binascii.Error):
         return None
 
+    return _decode_image_bytes(image_bytes)
+
+
+def _decode_image_bytes(image_bytes: bytes) -> Optional[np.ndarray]:
+    """Decode encoded image bytes (JPEG, PNG, GIF) into a BGR image matrix."""
+    # Reject truncated or non-image payloads before handing them to the codec
+    if len(image_bytes) < _MIN_IMAGE_BYTES or image_bytes[:3] not in _IMAGE_SIGNATURES:
+        return None
+
     image_array = np.frombuffer(image_bytes, dtype=np.uint8)
     image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
     return image
 
 
-def compress_image(image: np.ndarray) -> Optional[str]:
+def compress_image(image: np.ndarray) -> Optional[bytes]:
     """
-    Resize and compress an image, returning a base64 JPEG string.
+    Resize and compress an image, returning the JPEG bytes.
     """
     if image is None:
         return None
 
-    resized = cv2.resize(image, (640, 480))
-    success, buffer = cv2.imencode(".jpg", resized, [int(cv2.IMWRITE_JPEG_QUALITY), 75])
+    if image.shape[1] != 640 or image.shape[0] != 480:
+        # INTER_AREA averages source pixels, which keeps downscaled webcam frames sharper per byte
+        image = cv2.resize(image, (640, 480), interpolation=cv2.INTER_AREA)
+    success, buffer = cv2.imencode(".jpg", image, _JPEG_PARAMS)
     if not success:
         return None
 
-    encoded = base64.b64encode(buffer.tobytes()).decode("utf-8")
-    return encoded
+    return buffer.tobytes()
 
 
-def analyze_frame(image_base64: str) -> Dict[str, object]:
+def analyze_frame(image_base64: Union[bytes, str]) -> Dict[str, object]:
+    """
+    Analyze a base64 (or data URL) webcam frame and return a basic proctoring signal.
     """
-    Analyze a webcam frame and return a basic proctoring signal.
+    return _analyze_image(_decode_base64_image(image_base64))
+
+
+def analyze_image_bytes(image_bytes: bytes) -> Dict[str, object]:
     """
-    image = _decode_base64_image(image_base64)
+    Analyze a raw encoded webcam frame and return a basic proctoring signal.
+    """
+    return _analyze_image(_decode_image_bytes(image_bytes))
+
+
+def _get_onnx_session():
+    """Create the ONNX face detector once per process, or return None to use the cascade."""
+    global _onnx_session
+    if _onnx_session is None and ort is not None and FACE_DETECTOR_MODEL:
+        with _init_lock:
+            if _onnx_session is None:
+                available = set(ort.get_available_providers())
+                providers = [p for p in FACE_DETECTOR_PROVIDERS if p in available] or ['CPUExecutionProvider']
+                # InferenceSession.run is thread-safe, so one session serves the whole pool
+                _onnx_session = ort.InferenceSession(FACE_DETECTOR_MODEL, providers=providers)
+    return _onnx_session
+
+
+def _count_faces_onnx(session, image: np.ndarray) -> int:
+    """Run the ONNX detector on a letterboxed frame and count faces left after NMS."""
+    model_input = session.get_inputs()[0]
+    size = model_input.shape[2] if isinstance(model_input.shape[2], int) else _ONNX_INPUT_SIZE
+
+    height, width = image.shape[:2]
+    scale = min(size / height, size / width)
+    resized = cv2.resize(image, (int(round(width * scale)), int(round(height * scale))))
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[:resized.shape[0], :resized.shape[1]] = resized
+
+    blob = cv2.dnn.blobFromImage(canvas, 1 / 255.0, swapRB=True)
+    if model_input.type == "tensor(float16)":
+        blob = blob.astype(np.float16)
+
+    # YOLO heads emit (attributes, anchors); rows are cx, cy, w, h, score, ...
+    predictions = session.run(None, {model_input.name: blob})[0][0]
+    if predictions.shape[0] < predictions.shape[1]:
+        predictions = predictions.T
+
+    scores = predictions[:, 4].astype(np.float32)
+    keep = scores >= FACE_DETECTOR_CONFIDENCE
+    if not keep.any():
+        return 0
+
+    boxes = predictions[keep, :4].astype(np.float32)
+    boxes[:, :2] -= boxes[:, 2:] / 2
+    indices = cv2.dnn.NMSBoxes(
+        boxes.tolist(), scores[keep].tolist(), FACE_DETECTOR_CONFIDENCE, _ONNX_NMS_THRESHOLD
+    )
+    return len(indices)
+
+
+def _count_faces(image: np.ndarray) -> int:
+    """Count faces with the ONNX detector when configured, else the Haar cascade."""
+    session = _get_onnx_session()
+    if session is not None:
+        return _count_faces_onnx(session, image)
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Haar cost tracks pixel count; a 320px-wide frame keeps accuracy for webcam faces
+    height, width = gray.shape
+    min_side = _HAAR_MIN_FACE
+    if width > _HAAR_WIDTH:
+        gray = cv2.resize(
+            gray, (_HAAR_WIDTH, max(1, int(height * _HAAR_WIDTH / width))), interpolation=cv2.INTER_AREA
+        )
+        min_side = max(20, round(_HAAR_MIN_FACE * _HAAR_WIDTH / width))
+    faces = _thread_cascade().detectMultiScale(
+        gray, scaleFactor=1.1, minNeighbors=5, minSize=(min_side, min_side)
+    )
+    return len(faces)
+
+
+def _analyze_image(image: Optional[np.ndarray]) -> Dict[str, object]:
+    """Run face detection on a decoded frame and build the result dict."""
     if image is None:
         return {
             "alert": False,
@@ -59,22 +225,19 @@ def analyze_frame(image_base64: str) -> Dict[str, object]:
             "compressed_image": None,
         }
 
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    cascade_path = f"{cv2.data.haarcascades}haarcascade_frontalface_default.xml"
-    face_cascade = cv2.CascadeClassifier(cascade_path)
-    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60))
+    face_count = _count_faces(image)
 
     alert = False
     reason = None
     severity = None
     violation_type = None
 
-    if len(faces) == 0:
+    if face_count == 0:
         alert = True
         reason = "No face detected"
         severity = "warning"
         violation_type = "no_face"
-    elif len(faces) > 1:
+    elif face_count > 1:
         alert = True
         reason = "Multiple faces detected"
         severity = "critical"
@@ -87,3 +250,54 @@ def analyze_frame(image_base64: str) -> Dict[str, object]:
         "violation_type": violation_type,
         "compressed_image": compress_image(image),
     }
+
+
+class FramePoolFull(RuntimeError):
+    """Raised by submit_frame when FRAME_MAX_PENDING frames are already queued or running."""
+
+
+def _new_frame_pool() -> ThreadPoolExecutor:
+    """
+    Create the frame pool on real OS threads.
+
+    Under gevent's monkey-patching the stdlib executor's threads become
+    greenlets, so every OpenCV call would run on the hub and stall all of the
+    worker's connections. gevent's executor keeps native threads and gives
+    futures whose result() yields to the hub while waiting.
+    """
+    if gevent_monkey is not None and gevent_monkey.is_module_patched("threading"):
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor(max_workers=FRAME_WORKERS)
+    return ThreadPoolExecutor(max_workers=FRAME_WORKERS, thread_name_prefix="frame")
+
+
+def submit_frame(image_data: Union[str, bytes]) -> "Future[Dict[str, object]]":
+    """
+    Queue a frame for analysis in the shared thread pool, keeping decoding
+    and detection off the request threads.
+
+    JPEG decode and detectMultiScale release the GIL, so the pool's threads
+    run frames from different students in parallel without the pickling a
+    process pool needs. At most FRAME_MAX_PENDING frames are queued or
+    running at once; past that FramePoolFull is raised instead of growing
+    a backlog.
+
+    ``image_data`` is either a base64 string or raw encoded image bytes.
+    """
+    global _frame_pool, _frame_slots
+    if _frame_pool is None:
+        with _init_lock:
+            if _frame_pool is None:
+                _frame_slots = threading.BoundedSemaphore(FRAME_MAX_PENDING)
+                _frame_pool = _new_frame_pool()
+    slots = _frame_slots
+    if not slots.acquire(blocking=False):
+        raise FramePoolFull(f"{FRAME_MAX_PENDING} frames already pending")
+    analyze = analyze_image_bytes if isinstance(image_data, bytes) else analyze_frame
+    try:
+        future = _frame_pool.submit(analyze, image_data)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
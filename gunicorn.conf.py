@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for ProctorGuard backend
+Picked up automatically by `gunicorn app:app` when run from this directory
+"""
+
+import os
+from config import FLASK_HOST, FLASK_PORT
+
+bind = f"{FLASK_HOST}:{FLASK_PORT}"
+
+# Threaded workers let one process overlap many blocking SQLite and
+# frame-analysis calls instead of serializing them like the sync worker.
+# GUNICORN_WORKER_CLASS=gevent (pip install gevent) trades threads for
+# greenlets. detection.py then runs frames on gevent's native thread pool so
+# OpenCV doesn't stall the hub; SQLite calls still block the worker while
+# they run.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+workers = int(os.getenv('WEB_CONCURRENCY', str(2 * (os.cpu_count() or 1) + 1)))
+# Concurrent clients per worker for the async (gevent/eventlet) classes
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+
+# Import the app (and run database setup) once in the master before forking.
+# Async workers monkey-patch after fork, so the app must be imported there
+# instead or its locks and queues would be the unpatched blocking kind.
+preload_app = worker_class not in ('gevent', 'eventlet')
+
+# Frame analysis can be slow on cold workers; don't kill them too eagerly
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
@@ -3,31 +3,149 @@ Database models and helper functions for ProctorGuard
 Handles all database operations including initialization and queries
 """
 
+import atexit
+import base64
+import binascii
+import logging
+import os
+import queue
 import sqlite3
-import json
+import orjson
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from config import DATABASE_PATH
+from typing import List, Dict, Optional, Any, Iterator, Union
+from config import DATABASE_PATH, DB_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Pool of open connections shared by the threads of this process
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_pool_lock = threading.Lock()
+_pool_created = 0
+
+# Rows pulled per fetchmany() call when streaming results
+_FETCH_BATCH_SIZE = 256
 
 
 def get_db_connection():
     """
-    Get a connection to the SQLite database
+    Open a new, fully configured connection to the SQLite database
     
     Returns:
         sqlite3.Connection: Database connection object
     """
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Enable column access by name
         conn.execute('PRAGMA foreign_keys = ON')
-        print(f"[DB] Connected to database: {DATABASE_PATH}")
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('PRAGMA mmap_size = 268435456')
+        conn.execute('PRAGMA cache_size = -65536')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        logger.debug("Connected to database: %s", DATABASE_PATH)
         return conn
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Connection failed: {e}")
+        logger.debug("Connection failed: %s", e)
+        raise
+
+
+def _acquire_connection() -> sqlite3.Connection:
+    """Take an idle pooled connection, opening a new one while under the limit."""
+    global _pool_created
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        pass
+
+    with _pool_lock:
+        can_open = _pool_created < DB_POOL_SIZE
+        if can_open:
+            _pool_created += 1
+
+    if not can_open:
+        return _pool.get()
+
+    try:
+        return get_db_connection()
+    except sqlite3.Error:
+        with _pool_lock:
+            _pool_created -= 1
         raise
 
 
+def _release_connection(conn: sqlite3.Connection) -> None:
+    """Return a connection to the pool, discarding any unfinished transaction."""
+    if conn.in_transaction:
+        conn.rollback()
+    _pool.put_nowait(conn)
+
+
+def _reset_pool() -> None:
+    """Drop connections inherited from a parent process after fork."""
+    global _pool, _pool_created
+    _pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+    _pool_created = 0
+
+
+def _close_pool() -> None:
+    """Close idle pooled connections at interpreter exit."""
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool)
+atexit.register(_close_pool)
+
+
+@contextmanager
+def db_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a connection from the pool for the duration of a with-block
+    
+    Yields:
+        sqlite3.Connection: Pooled database connection
+    """
+    conn = _acquire_connection()
+    try:
+        yield conn
+    finally:
+        _release_connection(conn)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Group several writes into one BEGIN IMMEDIATE ... COMMIT (one fsync)
+    
+    Yields:
+        sqlite3.Connection: Connection to pass to the add_* helpers as ``conn``
+    """
+    with db_connection() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+@contextmanager
+def _write_connection(conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+    """Join the caller's transaction when given one, otherwise commit on exit."""
+    if conn is not None:
+        yield conn
+        return
+    with db_connection() as own_conn:
+        yield own_conn
+        own_conn.commit()
+
+
 def execute_query(query: str, params: tuple = ()) -> None:
     """
     Execute a database query (INSERT, UPDATE, DELETE)
@@ -39,19 +157,15 @@ def execute_query(query: str, params: tuple = ()) -> None:
     Raises:
         sqlite3.Error: If database operation fails
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        print(f"[DB] Query executed successfully")
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            conn.commit()
+            logger.debug("Query executed successfully")
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Query execution failed: {e}")
+        logger.debug("Query execution failed: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
 def fetch_one(query: str, params: tuple = ()) -> Optional[Dict]:
@@ -65,47 +179,144 @@ def fetch_one(query: str, params: tuple = ()) -> Optional[Dict]:
     Returns:
         Optional[Dict]: Single row as dictionary or None if no results
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        print(f"[DB] Fetched one row")
-        return dict(row) if row else None
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            logger.debug("Fetched one row")
+            return dict(row) if row else None
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Fetch one failed: {e}")
+        logger.debug("Fetch one failed: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
-def fetch_all(query: str, params: tuple = ()) -> List[Dict]:
+def fetch_all(query: str, params: tuple = (), row_factory=None) -> List[Dict]:
     """
     Fetch all rows from the database
     
     Args:
         query (str): SQL SELECT query
         params (tuple): Query parameters
+        row_factory (callable, optional): Cursor row factory that builds each result directly
     
     Returns:
         List[Dict]: List of rows as dictionaries
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        print(f"[DB] Fetched {len(rows)} rows")
-        return [dict(row) for row in rows]
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            if row_factory is not None:
+                cursor.row_factory = row_factory
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            logger.debug("Fetched %d rows", len(rows))
+            if row_factory is not None:
+                return rows
+            return [dict(row) for row in rows]
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Fetch all failed: {e}")
+        logger.debug("Fetch all failed: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
+
+
+def iter_rows(query: str, params: tuple = (), row_factory=None) -> Iterator[Dict]:
+    """
+    Yield rows from the database in fetchmany() batches instead of fetching them all
+    
+    The pooled connection stays checked out until the generator is exhausted
+    or closed, so callers must not leave it half-consumed.
+    
+    Args:
+        query (str): SQL SELECT query
+        params (tuple): Query parameters
+        row_factory (callable, optional): Cursor row factory that builds each result directly
+    
+    Yields:
+        Dict: Each row as a dictionary
+    """
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = _FETCH_BATCH_SIZE
+            if row_factory is not None:
+                cursor.row_factory = row_factory
+            cursor.execute(query, params)
+            try:
+                while True:
+                    batch = cursor.fetchmany()
+                    if not batch:
+                        break
+                    if row_factory is not None:
+                        yield from batch
+                    else:
+                        for row in batch:
+                            yield dict(row)
+            finally:
+                cursor.close()
+    except sqlite3.Error as e:
+        logger.debug("Iterating rows failed: %s", e)
+        raise
+
+
+# Column order matches submission_row below
+SUBMISSION_COLUMNS = 'id, student_id, exam_id, answers, score, flagged, submitted_at'
+
+
+def submission_row(cursor: sqlite3.Cursor, row: tuple) -> Dict:
+    """
+    Row factory building an API-ready submission from a SUBMISSION_COLUMNS tuple
+
+    The stored answers JSON is wrapped in an orjson.Fragment, so it is copied
+    into the response as-is instead of being parsed and re-encoded per row.
+    """
+    answers = row[3]
+    if isinstance(answers, str):
+        answers = orjson.Fragment(answers) if answers.strip() else {}
+    return {
+        'id': row[0],
+        'student_id': row[1],
+        'exam_id': row[2],
+        'answers': answers,
+        'score': row[4],
+        'flagged': bool(row[5]),
+        'submitted_at': row[6]
+    }
+
+
+def decode_screenshot(image_data: Union[bytes, str]) -> Union[bytes, str]:
+    """Decode a base64 or data URL screenshot to bytes, keeping the text if it isn't base64."""
+    if not isinstance(image_data, str):
+        return image_data
+    try:
+        return base64.b64decode(image_data.strip().split(',', 1)[-1], validate=True)
+    except binascii.Error:
+        return image_data
+
+
+def _migrate_text_screenshots(cursor: sqlite3.Cursor, batch_size: int = 500) -> int:
+    """Rewrite base64 TEXT screenshot rows as BLOBs in batches; returns rows converted."""
+    converted = 0
+    last_id = 0
+    while True:
+        cursor.execute(
+            '''
+            SELECT id, image_data FROM violation_screenshots
+            WHERE typeof(image_data) = 'text' AND id > ?
+            ORDER BY id LIMIT ?
+            ''',
+            (last_id, batch_size)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return converted
+        last_id = rows[-1][0]
+        updates = [
+            (image_bytes, row_id)
+            for row_id, image_bytes in ((row[0], decode_screenshot(row[1])) for row in rows)
+            if isinstance(image_bytes, bytes)
+        ]
+        cursor.executemany('UPDATE violation_screenshots SET image_data = ? WHERE id = ?', updates)
+        converted += len(updates)
 
 
 def init_database() -> None:
@@ -115,8 +326,13 @@ def init_database() -> None:
     """
     conn = None
     try:
+        # Use a dedicated connection so a preloading server master process
+        # does not hand pooled handles down to its forked workers
         conn = get_db_connection()
         cursor = conn.cursor()
+
+        # WAL lets readers proceed while a writer commits; it persists in the file
+        cursor.execute('PRAGMA journal_mode = WAL')
         
         # Create students table
         cursor.execute('''
@@ -129,6 +345,7 @@ def init_database() -> None:
             )
         ''')
         print("[DB] Students table created/verified")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_created ON students(created_at DESC)')
         
         # Create exams table
         cursor.execute('''
@@ -149,6 +366,8 @@ def init_database() -> None:
         if 'code' not in exam_columns:
             cursor.execute('ALTER TABLE exams ADD COLUMN code TEXT')
             print("[DB] Exams table updated with code column")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exams_code ON exams(code)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exams_created ON exams(created_at DESC)')
         
         # Create alerts table
         cursor.execute('''
@@ -164,6 +383,8 @@ def init_database() -> None:
             )
         ''')
         print("[DB] Alerts table created/verified")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_student_ts ON alerts(student_id, timestamp DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_ts ON alerts(timestamp DESC)')
         
         # Create submissions table
         cursor.execute('''
@@ -187,6 +408,10 @@ def init_database() -> None:
         if 'flagged' not in submission_columns:
             cursor.execute('ALTER TABLE submissions ADD COLUMN flagged INTEGER DEFAULT 0')
             print("[DB] Submissions table updated with flagged column")
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_submissions_student_time ON submissions(student_id, submitted_at DESC)'
+        )
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_submissions_time ON submissions(submitted_at DESC)')
 
         # Create violation_screenshots table
         cursor.execute('''
@@ -195,7 +420,7 @@ def init_database() -> None:
                 alert_id INTEGER NOT NULL,
                 student_id INTEGER NOT NULL,
                 exam_id INTEGER NOT NULL,
-                image_data TEXT NOT NULL,
+                image_data BLOB NOT NULL,
                 violation_type TEXT NOT NULL,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (alert_id) REFERENCES alerts(id),
@@ -204,6 +429,17 @@ def init_database() -> None:
             )
         ''')
         print("[DB] Violation screenshots table created/verified")
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_violation_screenshots_time ON violation_screenshots(timestamp DESC)'
+        )
+
+        # Convert screenshots stored as base64 text by older versions to BLOBs
+        migrated = _migrate_text_screenshots(cursor)
+        if migrated:
+            print(f"[DB] Violation screenshots converted to BLOB: {migrated}")
+
+        # Refresh planner statistics so the indexes above get used
+        cursor.execute('ANALYZE')
         
         conn.commit()
         print("[DB] Database initialization completed successfully")
@@ -216,7 +452,12 @@ def init_database() -> None:
             conn.close()
 
 
-def add_student(name: str, email: str, exam_id: Optional[str] = None) -> int:
+def add_student(
+    name: str,
+    email: str,
+    exam_id: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> Dict:
     """
     Add a new student to the database
     
@@ -224,31 +465,33 @@ def add_student(name: str, email: str, exam_id: Optional[str] = None) -> int:
         name (str): Student name
         email (str): Student email
         exam_id (Optional[str]): Associated exam ID
+        conn (Optional[sqlite3.Connection]): Open transaction to join
     
     Returns:
-        int: ID of the newly created student
+        Dict: The newly created student row
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO students (name, email, exam_id) VALUES (?, ?, ?)',
-            (name, email, exam_id)
-        )
-        conn.commit()
-        student_id = cursor.lastrowid
-        print(f"[DB] Student added with ID: {student_id}")
-        return student_id
+        with _write_connection(conn) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT INTO students (name, email, exam_id) VALUES (?, ?, ?) RETURNING *',
+                (name, email, exam_id)
+            )
+            student = dict(cursor.fetchone())
+            logger.debug("Student added with ID: %s", student['id'])
+            return student
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Failed to add student: {e}")
+        logger.debug("Failed to add student: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
-def add_exam(name: str, duration: int, total_questions: int, code: Optional[str] = None) -> int:
+def add_exam(
+    name: str,
+    duration: int,
+    total_questions: int,
+    code: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> Dict:
     """
     Add a new exam to the database
     
@@ -256,31 +499,33 @@ def add_exam(name: str, duration: int, total_questions: int, code: Optional[str]
         name (str): Exam name
         duration (int): Duration in minutes
         total_questions (int): Total number of questions
+        conn (Optional[sqlite3.Connection]): Open transaction to join
     
     Returns:
-        int: ID of the newly created exam
+        Dict: The newly created exam row
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO exams (name, code, duration, total_questions) VALUES (?, ?, ?, ?)',
-            (name, code, duration, total_questions)
-        )
-        conn.commit()
-        exam_id = cursor.lastrowid
-        print(f"[DB] Exam added with ID: {exam_id}")
-        return exam_id
+        with _write_connection(conn) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT INTO exams (name, code, duration, total_questions) VALUES (?, ?, ?, ?) RETURNING *',
+                (name, code, duration, total_questions)
+            )
+            exam = dict(cursor.fetchone())
+            logger.debug("Exam added with ID: %s", exam['id'])
+            return exam
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Failed to add exam: {e}")
+        logger.debug("Failed to add exam: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
-def add_alert(student_id: int, exam_id: int, reason: str, severity: str = 'warning') -> int:
+def add_alert(
+    student_id: int,
+    exam_id: int,
+    reason: str,
+    severity: str = 'warning',
+    conn: Optional[sqlite3.Connection] = None
+) -> Dict:
     """
     Add a new alert to the database
     
@@ -289,31 +534,35 @@ def add_alert(student_id: int, exam_id: int, reason: str, severity: str = 'warni
         exam_id (int): Exam ID
         reason (str): Reason for alert
         severity (str): Alert severity ('warning' or 'critical')
+        conn (Optional[sqlite3.Connection]): Open transaction to join
     
     Returns:
-        int: ID of the newly created alert
+        Dict: The newly created alert row
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO alerts (student_id, exam_id, reason, severity) VALUES (?, ?, ?, ?)',
-            (student_id, exam_id, reason, severity)
-        )
-        conn.commit()
-        alert_id = cursor.lastrowid
-        print(f"[DB] Alert added with ID: {alert_id}")
-        return alert_id
+        with _write_connection(conn) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT INTO alerts (student_id, exam_id, reason, severity) VALUES (?, ?, ?, ?) RETURNING *',
+                (student_id, exam_id, reason, severity)
+            )
+            alert = dict(cursor.fetchone())
+            logger.debug("Alert added with ID: %s", alert['id'])
+            return alert
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Failed to add alert: {e}")
+        logger.debug("Failed to add alert: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
-def add_submission(student_id: int, exam_id: int, answers: Dict, score: int, flagged: bool = False) -> int:
+def add_submission(
+    student_id: int,
+    exam_id: int,
+    answers: Dict,
+    score: int,
+    flagged: bool = False,
+    conn: Optional[sqlite3.Connection] = None,
+    answers_json: Optional[str] = None
+) -> Dict:
     """
     Add a new submission to the database
     
@@ -322,37 +571,49 @@ def add_submission(student_id: int, exam_id: int, answers: Dict, score: int, fla
         exam_id (int): Exam ID
         answers (Dict): Student's answers as dictionary
         score (int): Score obtained
+        conn (Optional[sqlite3.Connection]): Open transaction to join
+        answers_json (Optional[str]): Already-validated JSON text of ``answers`` to store as-is
     
     Returns:
-        int: ID of the newly created submission
+        Dict: The created submission, shaped like the submission list rows
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        answers_json = json.dumps(answers)
-        cursor.execute(
-            'INSERT INTO submissions (student_id, exam_id, answers, score, flagged) VALUES (?, ?, ?, ?, ?)',
-            (student_id, exam_id, answers_json, score, 1 if flagged else 0)
-        )
-        conn.commit()
-        submission_id = cursor.lastrowid
-        print(f"[DB] Submission added with ID: {submission_id}")
-        return submission_id
+        with _write_connection(conn) as conn:
+            cursor = conn.cursor()
+            if answers_json is None:
+                answers_json = orjson.dumps(answers, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            cursor.execute(
+                '''
+                INSERT INTO submissions (student_id, exam_id, answers, score, flagged)
+                VALUES (?, ?, ?, ?, ?)
+                RETURNING id, score, submitted_at
+                ''',
+                (student_id, exam_id, answers_json, score, 1 if flagged else 0)
+            )
+            row = cursor.fetchone()
+            logger.debug("Submission added with ID: %s", row['id'])
+            # Echo the caller's answers instead of re-parsing the stored JSON
+            return {
+                'id': row['id'],
+                'student_id': student_id,
+                'exam_id': exam_id,
+                'answers': answers,
+                'score': row['score'],
+                'flagged': bool(flagged),
+                'submitted_at': row['submitted_at']
+            }
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Failed to add submission: {e}")
+        logger.debug("Failed to add submission: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
 def add_violation_screenshot(
     alert_id: int,
     student_id: int,
     exam_id: int,
-    image_data: str,
-    violation_type: str
+    image_data: bytes,
+    violation_type: str,
+    conn: Optional[sqlite3.Connection] = None
 ) -> int:
     """
     Add a violation screenshot to the database
@@ -361,34 +622,62 @@ def add_violation_screenshot(
         alert_id (int): Linked alert ID
         student_id (int): Student ID
         exam_id (int): Exam ID
-        image_data (str): Base64 image data
+        image_data (bytes): Encoded JPEG/PNG bytes
         violation_type (str): Type of violation
+        conn (Optional[sqlite3.Connection]): Open transaction to join
     
     Returns:
         int: ID of the newly created screenshot record
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            INSERT INTO violation_screenshots
-            (alert_id, student_id, exam_id, image_data, violation_type)
-            VALUES (?, ?, ?, ?, ?)
-            ''',
-            (alert_id, student_id, exam_id, image_data, violation_type)
-        )
-        conn.commit()
-        screenshot_id = cursor.lastrowid
-        print(f"[DB] Violation screenshot added with ID: {screenshot_id}")
-        return screenshot_id
+        with _write_connection(conn) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                INSERT INTO violation_screenshots
+                (alert_id, student_id, exam_id, image_data, violation_type)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                (alert_id, student_id, exam_id, image_data, violation_type)
+            )
+            screenshot_id = cursor.lastrowid
+            logger.debug("Violation screenshot added with ID: %s", screenshot_id)
+            return screenshot_id
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Failed to add violation screenshot: {e}")
+        logger.debug("Failed to add violation screenshot: %s", e)
+        raise
+
+
+def add_violation_screenshots_bulk(
+    records: List[tuple],
+    conn: Optional[sqlite3.Connection] = None
+) -> int:
+    """
+    Add several violation screenshots with one executemany and one commit
+    
+    Args:
+        records (List[tuple]): (alert_id, student_id, exam_id, image_data, violation_type) rows
+        conn (Optional[sqlite3.Connection]): Open transaction to join
+    
+    Returns:
+        int: Number of screenshot records inserted
+    """
+    try:
+        with _write_connection(conn) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                '''
+                INSERT INTO violation_screenshots
+                (alert_id, student_id, exam_id, image_data, violation_type)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                records
+            )
+            logger.debug("Added %d violation screenshots", cursor.rowcount)
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.debug("Failed to add violation screenshots: %s", e)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 
 print("[MODELS] Models module loaded successfully")
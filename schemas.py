@@ -0,0 +1,158 @@
+"""
+Request body schemas for ProctorGuard API endpoints
+Validates and coerces incoming JSON in one pass with pydantic
+"""
+
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import BaseModel, BeforeValidator, Field, ValidationError, model_validator
+
+
+def resolve_student_id(student_id_value):
+    """Coerce student_id to int when possible, otherwise raise ValueError."""
+    if isinstance(student_id_value, int):
+        return student_id_value
+    if isinstance(student_id_value, str) and student_id_value.isdigit():
+        return int(student_id_value)
+    if isinstance(student_id_value, float) and student_id_value.is_integer():
+        return int(student_id_value)
+    raise ValueError('student_id must be a numeric value')
+
+
+def normalize_exam_ref(exam_id_value):
+    """Coerce exam_id to an int ID or a stripped exam code, otherwise raise ValueError."""
+    if isinstance(exam_id_value, int):
+        return exam_id_value
+    if isinstance(exam_id_value, float) and exam_id_value.is_integer():
+        return int(exam_id_value)
+    if isinstance(exam_id_value, str):
+        exam_id_value = exam_id_value.strip()
+        if exam_id_value.isdigit():
+            return int(exam_id_value)
+        if exam_id_value:
+            return exam_id_value
+    raise ValueError('exam_id is required')
+
+
+def coalesce_keys(data, fields: dict):
+    """
+    Apply the handlers' ``data.get(a) or data.get(b)`` fallback to a raw body
+
+    Required fields go through here too, so null, 0 and "" read as missing
+    just as the old ``not data.get(...)`` checks treated them.
+
+    Args:
+        data: Decoded JSON body; anything but a dict is returned unchanged
+        fields: Field name -> accepted keys, in order of preference
+
+    Returns:
+        The body with each field set to its first truthy key, or dropped
+        when none is truthy so it reads as missing
+    """
+    if not isinstance(data, dict):
+        return data
+    data = dict(data)
+    for field, keys in fields.items():
+        value = None
+        for key in keys:
+            value = value or data.pop(key, None)
+        if value:
+            data[field] = value
+    return data
+
+
+StudentId = Annotated[int, BeforeValidator(resolve_student_id)]
+ExamRef = Annotated[Union[int, str], BeforeValidator(normalize_exam_ref)]
+RequiredText = Annotated[str, Field(min_length=1)]
+# Exam codes may arrive as JSON numbers; they are stored as text either way
+ExamCode = Annotated[Optional[str], BeforeValidator(lambda value: None if value is None else str(value))]
+
+
+class StudentIn(BaseModel):
+    """Body of POST /api/students"""
+    name: RequiredText
+    email: RequiredText
+    exam_id: Optional[Union[int, str]] = None
+
+    @model_validator(mode='before')
+    @classmethod
+    def _coalesce(cls, data):
+        return coalesce_keys(data, {'name': ('name',), 'email': ('email',)})
+
+
+class ExamIn(BaseModel):
+    """Body of POST /api/exams"""
+    name: RequiredText
+    duration: Optional[int] = 0
+    total_questions: Optional[int] = 0
+    code: ExamCode = None
+
+    @model_validator(mode='before')
+    @classmethod
+    def _coalesce(cls, data):
+        return coalesce_keys(data, {'name': ('name',), 'code': ('code', 'exam_code')})
+
+
+class AlertIn(BaseModel):
+    """Body of POST /api/alerts"""
+    student_id: StudentId
+    exam_id: ExamRef
+    reason: RequiredText
+    severity: Literal['warning', 'critical'] = 'warning'
+
+    @model_validator(mode='before')
+    @classmethod
+    def _coalesce(cls, data):
+        return coalesce_keys(data, {
+            'student_id': ('student_id',),
+            'exam_id': ('exam_id',),
+            'reason': ('reason',),
+        })
+
+
+class FrameIn(BaseModel):
+    """JSON body of POST /api/analyze-frame"""
+    image: RequiredText
+    exam_id: ExamRef
+    student_id: StudentId
+
+    @model_validator(mode='before')
+    @classmethod
+    def _coalesce(cls, data):
+        return coalesce_keys(data, {
+            'image': ('image',),
+            'exam_id': ('examId', 'exam_id'),
+            'student_id': ('studentId', 'student_id'),
+        })
+
+
+def validation_message(exc: ValidationError, default: str) -> str:
+    """
+    Describe the validation failure for the API response
+
+    Errors on values the client did send are reported before missing fields,
+    so a bad ``severity`` is named even when ``reason`` is also absent.
+
+    Args:
+        exc: Error raised by ``model_validate_json``
+        default: The endpoint's "... required" message, used for missing or
+            empty fields and bodies that are not a JSON object
+
+    Returns:
+        str: Message naming the offending field
+    """
+    for error in exc.errors():
+        field = error['loc'][0] if error['loc'] else 'body'
+        error_type = error['type']
+        if error_type == 'value_error':
+            return str(error['ctx']['error'])
+        if len(error['loc']) > 1:
+            # Deeper locs name pydantic's union branches (e.g. exam_id.int)
+            return f"{field} has an invalid type"
+        if error_type == 'literal_error':
+            return f"{field} must be one of {error['ctx']['expected']}"
+        if error_type == 'string_type':
+            return f"{field} must be a string"
+        if error_type in ('int_type', 'int_parsing', 'int_from_float'):
+            return f"{field} must be an integer"
+    return default